@@ -1,15 +1,21 @@
 # FILE: app.py
 
 import os
+import threading
 from tkinter import PhotoImage
 import customtkinter as ctk
 import tkinter.messagebox as mb
+import tkinter.filedialog as fd
 
 from constants import resource_path
 from lesson import Lesson
 from matching import MatchingLesson
-from sentence_builder import SentenceBuilderLesson
-from progress_manager import load_progress, save_progress, reset_progress
+from sentence_builder import SentenceBuilderLesson, direction_from_filename
+from progress_manager import load_progress, save_progress, reset_progress, record_completion
+from search_index import SearchIndex
+from progress_sync import export_bundle, import_bundles, BUNDLE_SUFFIX
+from tracing import traced
+from vocab_trie import VocabTrie, load_vocabulary
 
 from ui.menu_frame import MenuFrame
 from ui.selection_frame import SelectionFrame
@@ -34,6 +40,9 @@ class LearnMacedonianApp(ctk.CTk):
 
         self._load_data()
         self._create_frames()
+        # typed-answer suggestions appear once the vocabulary trie is built;
+        # until then QuizFrame simply offers none
+        threading.Thread(target=self._build_vocab, daemon=True).start()
 
     def _load_data(self):
         lessons_path = resource_path('lessons')
@@ -42,7 +51,26 @@ class LearnMacedonianApp(ctk.CTk):
             if os.path.isdir(os.path.join(lessons_path, d))
         )
         self.unlocked_topic, self.topic_progress = load_progress()
-
+        # Loading/updating the persisted search index can take a while on big
+        # courses, so it runs off the Tk thread; searches wait for it.
+        self.search_index = None
+        self.search_error = None
+        threading.Thread(target=self._open_search_index, daemon=True).start()
+
+    def _open_search_index(self):
+        try:
+            self.search_index = SearchIndex().open()
+        except Exception as e:
+            # e.g. a lesson CSV the lesson classes cannot parse
+            self.search_error = f'Search is unavailable: {e}'
+
+    def _build_vocab(self):
+        try:
+            self.quiz.vocab = VocabTrie(load_vocabulary(resource_path('lessons')))
+        except (OSError, ValueError):
+            pass  # suggestions are optional; answers are still checked without them
+
+    @traced('LearnMacedonianApp._create_frames')
     def _create_frames(self):
         self.menu = MenuFrame(
             master=self,
@@ -51,11 +79,17 @@ class LearnMacedonianApp(ctk.CTk):
             on_view_progress=self.view_progress,
             on_save=self.manual_save,
             on_reset=self.reset_progress,
-            on_exit=self.destroy
+            on_exit=self.destroy,
+            on_export=self.export_progress,
+            on_import=self.import_progress,
+            on_search=self.search,
+            on_open_result=self.open_search_result
         )
         self.menu.pack(padx=50, pady=50)
 
-        self.quiz = QuizFrame(master=self, on_finish=self.finish_sublesson, on_back=self.back_to_selection)
+        self.quiz = QuizFrame(
+            master=self, on_finish=self.finish_sublesson, on_back=self.back_to_selection
+        )
         self.match = MatchFrame(master=self, on_finish=self.finish_sublesson, on_back=self.back_to_selection)
         self.sentence_builder = SentenceBuilderFrame(
             master=self, on_finish=self.finish_sublesson, on_back=self.back_to_selection
@@ -104,6 +138,22 @@ class LearnMacedonianApp(ctk.CTk):
         self.current_topic_idx = topic_idx
         self.sublessons = files
 
+    def search(self, query, limit):
+        """Return matches for the menu search, or a status message if there are none to give."""
+        if self.search_error:
+            return self.search_error
+        if self.search_index is None:
+            return 'Building search index…'
+        return self.search_index.search(query, limit)
+
+    def open_search_result(self, result):
+        if result['topic'] not in self.topics:
+            return
+        topic_idx = self.topics.index(result['topic'])
+        self.show_lessons(topic_idx)
+        if result['file'] in self.sublessons:
+            self.start_sublesson(topic_idx, self.sublessons.index(result['file']))
+
     def start_sublesson(self, topic_idx, sub_idx):
         topic = self.topics[topic_idx]
         display = topic.split('_', 1)[1].replace('_', ' ').title()
@@ -117,11 +167,7 @@ class LearnMacedonianApp(ctk.CTk):
             return
 
         if fn.startswith('sentence_'):
-            parts = fn[:-4].split('_')
-            if len(parts) >= 4 and parts[-2] in ('en', 'mk') and parts[-1] in ('en', 'mk'):
-                direction = f"{parts[-2]}->{parts[-1]}"
-            else:
-                direction = 'en->mk'
+            direction = direction_from_filename(fn)
             obj = SentenceBuilderLesson(filepath)
             self.selection.pack_forget()
             self.sentence_builder.start(obj, display, sub_idx, direction)
@@ -132,10 +178,11 @@ class LearnMacedonianApp(ctk.CTk):
         self.quiz.start(obj, display, sub_idx)
 
     def finish_sublesson(self, sub_idx, score):
-        tp = self.topic_progress.setdefault(self.topics[self.current_topic_idx], {})
-        tp['completed'] = max(tp.get('completed', 0), sub_idx + 1)
-        if tp['completed'] >= len(self.sublessons) and self.current_topic_idx == self.unlocked_topic:
-            self.unlocked_topic += 1
+        self.unlocked_topic = record_completion(
+            self.unlocked_topic, self.topic_progress,
+            self.topics[self.current_topic_idx], self.current_topic_idx,
+            sub_idx, len(self.sublessons)
+        )
         save_progress(self.unlocked_topic, self.topic_progress)
         self.show_lessons(self.current_topic_idx)
 
@@ -155,6 +202,39 @@ class LearnMacedonianApp(ctk.CTk):
         save_progress(self.unlocked_topic, self.topic_progress)
         mb.showinfo('Saved', 'Progress saved.')
 
+    def export_progress(self):
+        save_progress(self.unlocked_topic, self.topic_progress)
+        path = fd.asksaveasfilename(
+            title='Export Progress', defaultextension=BUNDLE_SUFFIX,
+            filetypes=[('Progress bundle', f'*{BUNDLE_SUFFIX}')]
+        )
+        if not path:
+            return
+        full = mb.askyesnocancel(
+            'Export Progress',
+            'Export all progress?\n\n'
+            'Yes: everything (use this if an earlier export was lost).\n'
+            'No: only changes since the last export.'
+        )
+        if full is None:
+            return
+        count = export_bundle(path, full=full)
+        mb.showinfo('Exported', f'Exported {count} topic(s).')
+
+    def import_progress(self):
+        paths = fd.askopenfilenames(
+            title='Import Progress', filetypes=[('Progress bundle', f'*{BUNDLE_SUFFIX}')]
+        )
+        if not paths:
+            return
+        save_progress(self.unlocked_topic, self.topic_progress)
+        try:
+            self.unlocked_topic, self.topic_progress = import_bundles(list(paths))
+        except (OSError, ValueError) as e:
+            mb.showerror('Import Failed', str(e))
+            return
+        mb.showinfo('Imported', f'Merged {len(paths)} bundle(s).')
+
     def reset_progress(self):
         if mb.askyesno('Reset', 'Reset all progress?'):
             reset_progress()
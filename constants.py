@@ -18,3 +18,7 @@ def resource_path(relative_path: str) -> str:
 BASE_DIR = os.path.abspath(".")
 LESSONS_DIR = resource_path('lessons')
 PROGRESS_FILE = resource_path('progress.json')
+SYNC_STATE_FILE = resource_path('sync_state.json')
+CLASSROOM_DIR = resource_path('classroom')
+AUDIO_CACHE_DIR = resource_path('audio_cache')
+SEARCH_INDEX_FILE = os.path.join(LESSONS_DIR, 'search_index.bin')
@@ -0,0 +1,331 @@
+# FILE: importer.py
+# Streams external vocabulary decks (TSV / Anki text exports) into lesson topics
+
+import os
+import re
+import csv
+import html
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from constants import LESSONS_DIR
+import tracing
+from tracing import span
+
+CHUNK_LINES = 5000
+DEFINITIONS_PER_FILE = 10
+MATCHES_PER_FILE = 8
+SENTENCES_PER_FILE = 10
+# QuizFrame draws three distractors per card, so a definitions file needs at least four rows
+MIN_CARDS_PER_FILE = 4
+# Shard numbers are zero-padded so that sorted() (the order show_lessons and
+# saved 'completed' counts rely on) matches the numbering.
+SHARD_DIGITS = 6
+
+_SEPARATORS = {
+    'tab': '\t', 'comma': ',', 'semicolon': ';', 'pipe': '|', 'colon': ':', 'space': ' ',
+}
+_TAG_RE = re.compile(r'<[^>]*>')
+_BREAK_RE = re.compile(r'<br\s*/?>|</div>|</p>', re.IGNORECASE)
+_SOUND_RE = re.compile(r'\[sound:[^\]]*\]')
+_SPACE_RE = re.compile(r'\s+')
+_HEADER_RE = re.compile(r'#([A-Za-z][A-Za-z ]*):(.*)$')
+
+
+def clean_field(text, strip_html=True):
+    """Strip Anki markup (HTML tags, entities, [sound:] refs) and collapse whitespace."""
+    if strip_html:
+        text = _BREAK_RE.sub(' ', text)
+        text = _TAG_RE.sub('', text)
+        text = _SOUND_RE.sub('', text)
+        text = html.unescape(text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def pair_key(en, mk):
+    """64-bit content hash used for deduplication, case-insensitive on both sides."""
+    digest = hashlib.blake2b(
+        f'{en.casefold()}\t{mk.casefold()}'.encode('utf-8'), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def parse_chunk(lines, delimiter, strip_html, mk_first, skip_columns=()):
+    """
+    Worker: turn raw deck lines into (english, macedonian, key) tuples, taking
+    the first two columns that are not Anki metadata (guid, notetype, ...).
+    """
+    out = []
+    for row in csv.reader(lines, delimiter=delimiter):
+        if skip_columns:
+            row = [c for i, c in enumerate(row) if i not in skip_columns]
+        if len(row) < 2:
+            continue
+        first = clean_field(row[0], strip_html)
+        second = clean_field(row[1], strip_html)
+        en, mk = (second, first) if mk_first else (first, second)
+        if en and mk:
+            out.append((en, mk, pair_key(en, mk)))
+    return out
+
+
+def _read_chunks(path, chunk_lines, settings):
+    """
+    Yield lists of data lines from the deck, applying the Anki '#key:value'
+    header lines that precede the first note to settings: separator, html,
+    and '#<field> column:N' metadata columns (guid, notetype, deck, tags),
+    which are excluded from the note fields. Any other line, including a
+    later one starting with '#', is data.
+    """
+    chunk = []
+    in_header = True
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        for line in f:
+            header = _HEADER_RE.match(line.rstrip('\r\n')) if in_header else None
+            if header:
+                key, value = header.group(1).strip().lower(), header.group(2).strip()
+                if key == 'separator':
+                    settings['delimiter'] = _SEPARATORS.get(value.lower(), value[:1] or '\t')
+                elif key == 'html':
+                    settings['strip_html'] = value.lower() == 'true'
+                elif key.endswith(' column'):
+                    if not value.isdigit() or int(value) < 1:
+                        raise ValueError(f'Unsupported Anki header: {line.strip()!r}')
+                    settings['skip_columns'] = settings['skip_columns'] | {int(value) - 1}
+                continue
+            if not line.strip():
+                continue
+            in_header = False
+            chunk.append(line)
+            if len(chunk) >= chunk_lines:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def existing_keys(lessons_dir=LESSONS_DIR):
+    """Hash set of every (English, Macedonian) pair already in the course."""
+    keys = set()
+    for topic in os.listdir(lessons_dir):
+        topic_path = os.path.join(lessons_dir, topic)
+        if not os.path.isdir(topic_path):
+            continue
+        for fn in os.listdir(topic_path):
+            if not fn.endswith('.csv'):
+                continue
+            with open(os.path.join(topic_path, fn), encoding='utf-8') as f:
+                for row in csv.reader(f):
+                    if len(row) >= 2 and row[0].strip() and row[1].strip():
+                        keys.add(pair_key(row[0].strip(), row[1].strip()))
+    return keys
+
+
+def topic_folder(name, lessons_dir=LESSONS_DIR):
+    """
+    Return the 'NN_Name' folder for a topic, reusing an existing folder with
+    the same name or numbering a new one after the last topic.
+
+    Importing into a topic that already has sublessons is refused: new files
+    would shift the sorted order that saved progress counts refer to.
+    """
+    slug = ''.join(w[:1].upper() + w[1:] for w in re.split(r'[^0-9A-Za-z]+', name) if w)
+    if not slug:
+        raise ValueError(f'Invalid topic name: {name!r}')
+    numbers = []
+    for d in os.listdir(lessons_dir):
+        if not os.path.isdir(os.path.join(lessons_dir, d)):
+            continue
+        num, _, rest = d.partition('_')
+        if rest.lower() == slug.lower():
+            if any(f.endswith('.csv') for f in os.listdir(os.path.join(lessons_dir, d))):
+                raise ValueError(
+                    f'Topic {d} already has sublessons; import into a new topic name instead'
+                )
+            return d
+        if num.isdigit():
+            numbers.append(int(num))
+    return f'{max(numbers, default=0) + 1:02d}_{slug}'
+
+
+class ShardWriter:
+    """
+    Writes rows into numbered CSV files of a fixed size, holding at most one
+    file's worth of rows in memory. A short final shard is folded into the
+    previous file so every sublesson stays playable; if there is no previous
+    file it is dropped.
+    """
+    def __init__(self, folder, name_fn, per_file, min_rows=1):
+        self.folder = folder
+        self.name_fn = name_fn
+        self.per_file = per_file
+        self.min_rows = min_rows
+        self.rows = []
+        self.files = []
+        self.index = 1
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.per_file:
+            self._flush()
+
+    def _flush(self, mode='w'):
+        path = os.path.join(self.folder, self.name_fn(self.index))
+        if mode == 'a':
+            path = self.files[-1]
+        with open(path, mode, encoding='utf-8', newline='') as f:
+            csv.writer(f, lineterminator='\n').writerows(self.rows)
+        if mode == 'w':
+            self.files.append(path)
+            self.index += 1
+        self.rows = []
+
+    def close(self):
+        """Write the final shard; returns the number of rows that could not be written."""
+        if not self.rows:
+            return 0
+        if len(self.rows) >= self.min_rows:
+            self._flush()
+        elif self.files:
+            self._flush(mode='a')
+        else:
+            dropped, self.rows = len(self.rows), []
+            return dropped
+        return 0
+
+
+class _MatchShard(ShardWriter):
+    """
+    MatchingLesson maps left→right, so each file keeps both columns unique,
+    including a short tail that close() appends to the previous file.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._left, self._right = set(), set()
+        self._prev_left, self._prev_right = set(), set()
+
+    def add(self, row):
+        if row[0] in self._left or row[1] in self._right:
+            return
+        self._left.add(row[0])
+        self._right.add(row[1])
+        super().add(row)
+
+    def _flush(self, mode='w'):
+        super()._flush(mode)
+        self._prev_left, self._prev_right = self._left, self._right
+        self._left, self._right = set(), set()
+
+    def close(self):
+        if self.rows and len(self.rows) < self.min_rows and self.files:
+            # the tail joins the previous file; matching is only a view of the
+            # imported pairs, so colliding rows are simply left out of it
+            self.rows = [r for r in self.rows
+                         if r[0] not in self._prev_left and r[1] not in self._prev_right]
+        return super().close()
+
+
+def _is_sentence(en, mk):
+    return len(en.split()) >= 3 and len(mk.split()) >= 2
+
+
+def import_deck(path, topic, mk_first=False, workers=None, lessons_dir=LESSONS_DIR,
+                definitions_per_file=DEFINITIONS_PER_FILE,
+                matches_per_file=MATCHES_PER_FILE,
+                sentences_per_file=SENTENCES_PER_FILE):
+    """
+    Stream a deck into lessons/<NN_Topic>/, skipping pairs already in the course.
+    Lines are parsed in worker processes with a bounded number of chunks in
+    flight, so memory is capped by the chunk window plus the dedup hash set.
+    Returns a dict of counts.
+    """
+    if definitions_per_file < MIN_CARDS_PER_FILE:
+        raise ValueError(f'A definitions sublesson needs at least {MIN_CARDS_PER_FILE} cards per file')
+    folder_name = topic_folder(topic, lessons_dir)
+    folder = os.path.join(lessons_dir, folder_name)
+    os.makedirs(folder, exist_ok=True)
+    prefix = folder_name.split('_', 1)[1].lower()
+
+    with span('importer.existing_keys'):
+        seen = existing_keys(lessons_dir)
+
+    definitions = ShardWriter(folder, lambda i: f'{prefix}{i:0{SHARD_DIGITS}d}.csv',
+                              definitions_per_file, MIN_CARDS_PER_FILE)
+    matches = _MatchShard(folder, lambda i: f'match_{i:0{SHARD_DIGITS}d}.csv', matches_per_file, 2)
+    sentences = ShardWriter(folder, lambda i: f'sentence_{i:0{SHARD_DIGITS}d}_en_mk.csv',
+                            sentences_per_file)
+
+    counts = {'read': 0, 'imported': 0, 'duplicates': 0}
+    settings = {'delimiter': '\t', 'strip_html': True, 'skip_columns': frozenset()}
+    workers = workers or os.cpu_count() or 1
+    window = deque()
+
+    def drain_one():
+        for en, mk, key in window.popleft().result():
+            counts['read'] += 1
+            if key in seen:
+                counts['duplicates'] += 1
+                continue
+            seen.add(key)
+            counts['imported'] += 1
+            definitions.add((en, mk))
+            if _is_sentence(en, mk):
+                sentences.add((en, mk))
+            else:
+                matches.add((en, mk))
+
+    with span('importer.import_deck', path=path), ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _read_chunks(path, CHUNK_LINES, settings):
+            window.append(pool.submit(
+                parse_chunk, chunk, settings['delimiter'], settings['strip_html'],
+                mk_first, settings['skip_columns']
+            ))
+            if len(window) >= workers * 2:
+                drain_one()
+        while window:
+            drain_one()
+
+    # Every imported pair goes to definitions; if too few arrived to fill one
+    # playable file, nothing is written and the pairs are not counted.
+    dropped = definitions.close()
+    if dropped:
+        counts['imported'] -= dropped
+        counts['too_few'] = dropped
+        if not os.listdir(folder):
+            os.rmdir(folder)
+    else:
+        matches.close()
+        sentences.close()
+
+    counts['topic'] = folder_name
+    counts['files'] = len(definitions.files) + len(matches.files) + len(sentences.files)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import a TSV or Anki text export into a lesson topic.')
+    parser.add_argument('deck', help='path to the .tsv / .txt export')
+    parser.add_argument('--topic', required=True, help="topic name, e.g. 'Animals'")
+    parser.add_argument('--mk-first', action='store_true',
+                        help='the first column is Macedonian (default: English first)')
+    parser.add_argument('--workers', type=int, default=None, help='parser processes (default: CPU count)')
+    parser.add_argument('--per-file', type=int, default=DEFINITIONS_PER_FILE,
+                        help='cards per definitions sublesson')
+    args = parser.parse_args(argv)
+    tracing.enable_from_env()
+
+    try:
+        counts = import_deck(args.deck, args.topic, mk_first=args.mk_first,
+                             workers=args.workers, definitions_per_file=args.per_file)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{counts['topic']}: imported {counts['imported']} of {counts['read']} "
+          f"({counts['duplicates']} duplicates) into {counts['files']} files")
+    if counts.get('too_few'):
+        print(f"skipped {counts['too_few']} new pairs: a sublesson needs at least {MIN_CARDS_PER_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
 import csv, random
 
+from tracing import span
+
 class Lesson:
     def __init__(self, filepath):
         self.cards = []
-        with open(filepath, encoding='utf-8') as f:
+        with span('Lesson.parse', path=filepath), open(filepath, encoding='utf-8') as f:
             for q, a in csv.reader(f):
                 if q and a:
                     self.cards.append((q.strip(), a.strip()))
@@ -0,0 +1,129 @@
+# FILE: loadgen.py
+# Load generator for the classroom server: many simulated learners on localhost
+
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import tracing
+
+
+class _Client:
+    """One simulated learner on a single keep-alive connection."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write(
+            f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+            f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        if status >= 400:
+            raise RuntimeError(f'{method} {path} -> {status}: {data[:200]!r}')
+        return json.loads(data)
+
+
+async def _learner(n, host, port, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    client = _Client(reader, writer)
+    rng = random.Random(n)
+
+    async def timed(method, path, payload=None):
+        start = time.perf_counter()
+        result = await client.request(method, path, payload)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    try:
+        session = (await timed('POST', '/sessions', {'learner': f'loadgen{n}'}))['session']
+        topics = await timed('GET', '/topics')
+        while time.perf_counter() < deadline:
+            topic = rng.choice(topics)
+            subs = await timed('GET', f"/topics/{topic['id']}")
+            sub = rng.choice(subs)
+            await timed('GET', f"/topics/{topic['id']}/{sub['index']}")
+            await timed('POST', f'/sessions/{session}/complete',
+                        {'topic': topic['id'], 'sublesson': sub['index']})
+    finally:
+        writer.close()
+
+
+async def run(clients=500, duration=10.0, host='127.0.0.1', port=8765, in_process=True):
+    """
+    Drive `clients` concurrent learners for `duration` seconds and return stats.
+    With in_process=True a server is started on the same event loop, which
+    measures the server's throughput while sharing its single core.
+    """
+    server = None
+    if in_process:
+        import tempfile
+        from server import ClassroomServer, ProgressStore
+        server = ClassroomServer(store=ProgressStore(tempfile.mkdtemp(prefix='classroom_')))
+        await server.start(host, port)
+
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + duration
+    try:
+        results = await asyncio.gather(
+            *(_learner(n, host, port, deadline, latencies) for n in range(clients)),
+            return_exceptions=True
+        )
+    finally:
+        if server:
+            await server.stop()
+    elapsed = time.perf_counter() - start
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    latencies.sort()
+    pick = lambda pct: latencies[round(pct / 100 * (len(latencies) - 1))] * 1000 if latencies else 0.0
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'first_error': repr(errors[0]) if errors else None,
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': pick(50),
+        'p95_ms': pick(95),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate concurrent learners against the classroom server.')
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--external', action='store_true',
+                        help='target an already running server instead of starting one in-process')
+    args = parser.parse_args(argv)
+    # the in-process server's spans (ProgressStore.write, ...) are recorded too
+    tracing.enable_from_env()
+
+    stats = asyncio.run(run(args.clients, args.duration, args.host, args.port, not args.external))
+    print(f"{stats['clients']} clients, {stats['requests']} requests in {stats['seconds']:.1f}s: "
+          f"{stats['rps']:.0f} req/s, p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+          f"{stats['errors']} errors")
+    if stats['first_error']:
+        print(f"first error: {stats['first_error']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,58 @@
-from app import LearnMacedonianApp
+import argparse
+
+import tracing
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Learn Macedonian')
+    parser.add_argument(
+        '--trace', nargs='?', const='trace.json', metavar='PATH',
+        help='record hot-path spans and write a Chrome trace to PATH on exit '
+             '(also enabled by the LEARNMK_TRACE environment variable)'
+    )
+    parser.add_argument(
+        '--serve', action='store_true',
+        help='run the classroom server instead of the desktop app'
+    )
+    parser.add_argument(
+        '--export-progress', metavar='BUNDLE',
+        help='write progress changed since the last export to BUNDLE and exit'
+    )
+    parser.add_argument(
+        '--full', action='store_true',
+        help='with --export-progress, export all progress instead of changes since the last export'
+    )
+    parser.add_argument(
+        '--import-progress', nargs='+', metavar='BUNDLE',
+        help='merge one or more progress bundles into progress.json and exit'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='classroom server address')
+    parser.add_argument('--port', type=int, default=8765, help='classroom server port')
+    return parser
+
 
 if __name__ == '__main__':
-    LearnMacedonianApp().mainloop()
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.full and not args.export_progress:
+        parser.error('--full requires --export-progress')
+    if args.trace:
+        tracing.enable(args.trace)
+    else:
+        tracing.enable_from_env()
+
+    if args.export_progress or args.import_progress:
+        import progress_sync
+        try:
+            if args.import_progress:
+                progress_sync.import_bundles(args.import_progress)
+            if args.export_progress:
+                progress_sync.export_bundle(args.export_progress, full=args.full)
+        except (ValueError, OSError) as e:
+            parser.error(str(e))
+    elif args.serve:
+        from server import serve
+        serve(args.host, args.port)
+    else:
+        from app import LearnMacedonianApp
+        LearnMacedonianApp().mainloop()
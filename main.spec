@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('lessons', 'lessons'), ('ui', 'ui'), ('progress.json', '.')],
-    hiddenimports=[],
+    hiddenimports=['miniaudio'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -4,10 +4,12 @@
 import csv
 import random
 
+from tracing import span
+
 class MatchingLesson:
     def __init__(self, filepath):
         self.pairs = []
-        with open(filepath, encoding='utf-8') as f:
+        with span('MatchingLesson.parse', path=filepath), open(filepath, encoding='utf-8') as f:
             reader = csv.reader(f)
             for left, right in reader:
                 if left and right:
@@ -1,24 +1,34 @@
 import os, json
 from constants import PROGRESS_FILE
+from tracing import traced
 
-def load_progress():
-    if os.path.exists(PROGRESS_FILE):
+def load_progress(path=PROGRESS_FILE):
+    if os.path.exists(path):
         try:
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 return data.get('unlocked_topic', 0), data.get('topic_progress', {})
         except Exception:
             pass
     return 0, {}
 
-def save_progress(unlocked_topic, topic_progress):
+@traced('save_progress')
+def save_progress(unlocked_topic, topic_progress, path=PROGRESS_FILE):
     payload = {
         'unlocked_topic': unlocked_topic,
         'topic_progress': topic_progress
     }
-    with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
+    with open(path, 'w', encoding='utf-8') as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
 
-def reset_progress():
-    if os.path.exists(PROGRESS_FILE):
-        os.remove(PROGRESS_FILE)
+def reset_progress(path=PROGRESS_FILE):
+    if os.path.exists(path):
+        os.remove(path)
+
+def record_completion(unlocked_topic, topic_progress, topic, topic_idx, sub_idx, total_sublessons):
+    """Mark a sublesson finished and return the (possibly advanced) unlocked topic index."""
+    tp = topic_progress.setdefault(topic, {})
+    tp['completed'] = max(tp.get('completed', 0), sub_idx + 1)
+    if tp['completed'] >= total_sublessons and topic_idx == unlocked_topic:
+        unlocked_topic += 1
+    return unlocked_topic
@@ -0,0 +1,165 @@
+# FILE: progress_sync.py
+# Delta bundles for carrying progress between machines without a server
+
+import os
+import json
+import gzip
+import uuid
+import time
+import zlib
+
+from constants import PROGRESS_FILE, SYNC_STATE_FILE
+from progress_manager import load_progress, save_progress
+from tracing import span
+
+BUNDLE_FORMAT = 'learnmk-progress'
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = '.lmkp'
+
+# Bundles are gzip-compressed JSON lines: a header line, then one record per
+# changed topic ({"t": topic, "d": data}) and optionally {"u": unlocked_topic}.
+
+
+def merge_topic_into(dst, src, seen):
+    """
+    Commutative, idempotent merge of per-topic progress dict src into dst, in
+    place: numbers (e.g. 'completed') take the max, lists (histories) take
+    the union. `seen` maps each list field to the set of its serialised
+    items and is kept by the caller across records, so merging costs
+    O(len(src)) rather than O(len(dst)) per record.
+    """
+    for key, value in src.items():
+        mine = dst.get(key)
+        if isinstance(value, list) and (mine is None or isinstance(mine, list)):
+            if mine is None:
+                mine = dst[key] = []
+            have = seen.get(key)
+            if have is None:
+                have = seen[key] = {json.dumps(v, sort_keys=True) for v in mine}
+            for v in value:
+                k = json.dumps(v, sort_keys=True)
+                if k not in have:
+                    have.add(k)
+                    mine.append(v)
+        elif mine is None:
+            dst[key] = value
+        elif isinstance(value, (int, float)) and isinstance(mine, (int, float)):
+            dst[key] = max(mine, value)
+    return dst
+
+
+def merge_topic(a, b):
+    """Merged copy of two per-topic progress dicts (see merge_topic_into)."""
+    out = {k: list(v) if isinstance(v, list) else v for k, v in a.items()}
+    return merge_topic_into(out, b, {})
+
+
+def _load_state(path=SYNC_STATE_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {'machine': uuid.uuid4().hex, 'seq': 0, 'watermark': {}}
+
+
+def _save_state(state, path=SYNC_STATE_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+
+
+def export_bundle(out_path, full=False, progress_path=PROGRESS_FILE, state_path=SYNC_STATE_FILE):
+    """
+    Write the progress that changed since the last export to out_path and move
+    the watermark forward. full=True ignores the watermark and writes all
+    progress, for when an earlier bundle was lost. Returns the number of
+    topic records written.
+    """
+    unlocked, progress = load_progress(progress_path)
+    state = _load_state(state_path)
+    mark = {} if full else state['watermark']
+
+    changed = {t: d for t, d in progress.items() if mark.get('topics', {}).get(t) != d}
+    state['seq'] += 1
+    header = {
+        'format': BUNDLE_FORMAT, 'version': BUNDLE_VERSION,
+        'machine': state['machine'], 'seq': state['seq'], 'created': int(time.time()),
+    }
+    with span('progress_sync.export', topics=len(changed)), gzip.open(out_path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps(header, separators=(',', ':')) + '\n')
+        if mark.get('unlocked') != unlocked:
+            f.write(json.dumps({'u': unlocked}) + '\n')
+        for topic, data in changed.items():
+            f.write(json.dumps({'t': topic, 'd': data}, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    state['watermark'] = {'unlocked': unlocked, 'topics': progress}
+    _save_state(state, state_path)
+    return len(changed)
+
+
+def read_bundle(path):
+    """
+    Yield the records of one bundle, streaming. Anything unreadable (not a
+    bundle, truncated or corrupt data, malformed records) raises ValueError.
+    """
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                raise ValueError(f'{path} is not a progress bundle')
+            if not isinstance(header, dict) or header.get('format') != BUNDLE_FORMAT:
+                raise ValueError(f'{path} is not a progress bundle')
+            version = header.get('version')
+            if not isinstance(version, int):
+                raise ValueError(f'{path} is not a progress bundle')
+            if version > BUNDLE_VERSION:
+                raise ValueError(f'{path} was written by a newer version (v{version})')
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if not isinstance(rec, dict):
+                    raise ValueError(f'{path} contains a malformed record')
+                yield rec
+    except (EOFError, zlib.error, gzip.BadGzipFile, UnicodeDecodeError) as e:
+        raise ValueError(f'{path} is truncated or corrupt ({e})')
+
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def merge_bundles(paths, unlocked=0, progress=None):
+    """
+    Fold any number of bundles into (unlocked_topic, topic_progress). Every
+    record is applied with max/union, so the order of bundles does not matter
+    and a bundle applied twice changes nothing. Runs in one streaming pass.
+    Topic fields must be counts (ints such as 'completed') or lists.
+    """
+    progress = {t: merge_topic({}, d) for t, d in (progress or {}).items()}
+    seen = {}  # topic -> {list field: serialised items}, shared by the whole pass
+    for path in paths:
+        for rec in read_bundle(path):
+            if 'u' in rec:
+                if not _is_count(rec['u']):
+                    raise ValueError(f'{path} contains a malformed record')
+                unlocked = max(unlocked, rec['u'])
+            elif 't' in rec:
+                topic, data = rec['t'], rec.get('d')
+                if not isinstance(topic, str) or not isinstance(data, dict):
+                    raise ValueError(f'{path} contains a malformed record')
+                for key, value in data.items():
+                    if not (_is_count(value) or isinstance(value, list)):
+                        raise ValueError(f'{path} has an invalid {key!r} for topic {topic!r}')
+                merge_topic_into(progress.setdefault(topic, {}), data, seen.setdefault(topic, {}))
+    return unlocked, progress
+
+
+def import_bundles(paths, progress_path=PROGRESS_FILE):
+    """Merge bundles into the local progress file and return the merged state."""
+    with span('progress_sync.import', bundles=len(paths)):
+        unlocked, progress = merge_bundles(paths, *load_progress(progress_path))
+    save_progress(unlocked, progress, path=progress_path)
+    return unlocked, progress
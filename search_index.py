@@ -0,0 +1,299 @@
+# FILE: search_index.py
+# Trigram inverted index over every English/Macedonian string in the course
+
+import os
+import sys
+import json
+import heapq
+import struct
+from array import array
+from bisect import bisect_right
+from collections import Counter
+
+from constants import LESSONS_DIR, SEARCH_INDEX_FILE
+from lesson import Lesson
+from matching import MatchingLesson
+from sentence_builder import SentenceBuilderLesson
+from transliteration import normalize
+from tracing import span
+
+INDEX_MAGIC = b'LMKSRCH\n'
+INDEX_VERSION = 2
+# Postings longer than this are skipped once rarer trigrams have produced
+# candidates: they barely change the ranking and dominate query time.
+MAX_POSTINGS = 2000
+# Compact (full rebuild) once this share of documents belongs to stale files.
+COMPACT_RATIO = 0.5
+# Document text is encoded in blocks of this many documents, so loading and
+# saving are many short calls rather than one long one that holds the GIL
+# (and with it the Tk loop) for the whole index.
+TEXT_BLOCK = 4096
+
+# On disk: INDEX_MAGIC, a u32 header length, a small JSON header, then the
+# sections below as raw bytes. Integer sections are native-endian arrays;
+# the header records byte order and item size, and a mismatch means rebuild.
+_SECTIONS = ('segment_keys', 'segment_nums', 'dead', 'grams', 'gram_sizes', 'postings', 'text')
+
+
+def trigrams(text):
+    padded = f' {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _doc_grams(en, mk):
+    return trigrams(en.casefold()) | trigrams(normalize(mk))
+
+
+def _query_grams(query):
+    # Latin input may be English or transliterated Macedonian, so match both
+    return trigrams(query.casefold().strip()) | trigrams(normalize(query))
+
+
+def _ints(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+def read_entries(filepath):
+    """(english, macedonian) pairs as loaded by the lesson class for this file."""
+    fn = os.path.basename(filepath)
+    if fn.startswith('match_'):
+        return MatchingLesson(filepath).pairs
+    if fn.startswith('sentence_'):
+        return [(eng, mac) for eng, mac, _, _ in SentenceBuilderLesson(filepath).items]
+    return Lesson(filepath).cards
+
+
+class SearchIndex:
+    """
+    Inverted index from trigram to sorted document ids. Documents are
+    appended per CSV file ("segment"); when a file changes its old documents
+    are marked dead and the new rows appended, so updates cost only the
+    changed files. The index is persisted next to the lessons in a compact
+    binary form (see _SECTIONS) that loads without decoding every posting.
+    """
+    def __init__(self, lessons_dir=LESSONS_DIR, index_path=SEARCH_INDEX_FILE):
+        self.lessons_dir = lessons_dir
+        self.index_path = index_path
+        self._reset()
+
+    def _reset(self):
+        self.texts = []       # english, macedonian of document d at 2d, 2d + 1
+        self.segments = {}    # 'topic/file.csv' -> {'sig': [mtime_ns, size], 'ids': [first, end)}
+        self.postings = {}    # trigram -> array('I') of doc ids, ascending
+        self.dead = set()
+        self._owners = None   # (first ids, segment keys) for mapping a doc to its file
+
+    @property
+    def doc_count(self):
+        return len(self.texts) // 2
+
+    # ---- persistence ---------------------------------------------------
+
+    def load(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = memoryview(f.read())
+        except OSError:
+            return False
+        self._reset()
+        try:
+            self._decode(data)
+        except (ValueError, KeyError, TypeError, IndexError, struct.error):
+            self._reset()  # stale format or damaged file: rebuild from the CSVs
+            return False
+        return True
+
+    def _decode(self, data):
+        if data[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError('not a search index')
+        pos = len(INDEX_MAGIC)
+        (size,) = struct.unpack_from('<I', data, pos)
+        pos += 4
+        header = json.loads(bytes(data[pos:pos + size]))
+        pos += size
+        if (header['version'], header['byteorder'], header['itemsize']) != (
+                INDEX_VERSION, sys.byteorder, [array('I').itemsize, array('q').itemsize]):
+            raise ValueError('index written by another version or platform')
+        sections = {}
+        for name in _SECTIONS:
+            n = header['sections'][name]
+            sections[name] = data[pos:pos + n]
+            pos += n
+
+        keys = str(sections['segment_keys'], 'utf-8').split('\0') if header['segments'] else []
+        nums = _ints('q', sections['segment_nums'])
+        if len(nums) != 4 * len(keys):
+            raise ValueError('segment table mismatch')
+        for i, key in enumerate(keys):
+            self.segments[key] = {'sig': [nums[4 * i], nums[4 * i + 1]],
+                                  'ids': [nums[4 * i + 2], nums[4 * i + 3]]}
+        self.dead = set(_ints('I', sections['dead']))
+
+        grams = str(sections['grams'], 'utf-8')
+        sizes = _ints('I', sections['gram_sizes'])
+        ids, width = sections['postings'], array('I').itemsize
+        if len(grams) != 3 * len(sizes) or sum(sizes) * width != len(ids):
+            raise ValueError('postings table mismatch')
+        start = 0
+        for i, n in enumerate(sizes):
+            # one copy per gram rather than one for the whole section
+            self.postings[grams[3 * i:3 * i + 3]] = _ints('I', ids[start:start + n * width])
+            start += n * width
+
+        text, start = sections['text'], 0
+        for n in header['blocks']:
+            self.texts.extend(str(text[start:start + n], 'utf-8').split('\0'))
+            start += n
+        if len(self.texts) != 2 * header['docs']:
+            raise ValueError('document table mismatch')
+
+    def save(self):
+        step = 2 * TEXT_BLOCK
+        blocks = [
+            '\0'.join(self.texts[i:i + step]).encode('utf-8')
+            for i in range(0, len(self.texts), step)
+        ]
+        nums = array('q')
+        for seg in self.segments.values():
+            nums.extend(seg['sig'] + seg['ids'])
+        grams = list(self.postings)
+        sections = {
+            'segment_keys': ['\0'.join(self.segments).encode('utf-8')],
+            'segment_nums': [nums],
+            'dead': [array('I', self.dead)],
+            'grams': [''.join(grams).encode('utf-8')],
+            'gram_sizes': [array('I', (len(self.postings[g]) for g in grams))],
+            'postings': [self.postings[g] for g in grams],
+            'text': blocks,
+        }
+        header = json.dumps({
+            'version': INDEX_VERSION, 'byteorder': sys.byteorder,
+            'itemsize': [array('I').itemsize, array('q').itemsize],
+            'docs': self.doc_count, 'segments': len(self.segments),
+            'blocks': [len(b) for b in blocks],
+            'sections': {name: sum(memoryview(p).nbytes for p in parts)
+                         for name, parts in sections.items()},
+        }).encode('utf-8')
+
+        tmp = self.index_path + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(INDEX_MAGIC)
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                for name in _SECTIONS:
+                    for part in sections[name]:
+                        f.write(part)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass  # read-only install: keep the in-memory index
+
+    # ---- building ------------------------------------------------------
+
+    def _scan(self):
+        found = {}
+        for topic in sorted(os.listdir(self.lessons_dir)):
+            topic_path = os.path.join(self.lessons_dir, topic)
+            if not os.path.isdir(topic_path):
+                continue
+            for fn in sorted(os.listdir(topic_path)):
+                if fn.endswith('.csv'):
+                    st = os.stat(os.path.join(topic_path, fn))
+                    found[f'{topic}/{fn}'] = [st.st_mtime_ns, st.st_size]
+        return found
+
+    def _add_segment(self, key, sig):
+        first = self.doc_count
+        entries = read_entries(os.path.join(self.lessons_dir, *key.split('/')))
+        postings = self.postings
+        for en, mk in entries:
+            doc_id = self.doc_count
+            # NUL separates documents on disk
+            self.texts.append(en.replace('\0', ''))
+            self.texts.append(mk.replace('\0', ''))
+            for gram in _doc_grams(en, mk):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array('I')
+                ids.append(doc_id)
+        self.segments[key] = {'sig': sig, 'ids': [first, self.doc_count]}
+        self._owners = None
+
+    def _drop_segment(self, key):
+        first, end = self.segments.pop(key)['ids']
+        self.dead.update(range(first, end))
+        self._owners = None
+
+    def _segment_of(self, doc_id):
+        # segments are kept in order of their first id (they are only ever
+        # appended), so the owner of a live document is found by bisection
+        if self._owners is None:
+            self._owners = ([s['ids'][0] for s in self.segments.values()], list(self.segments))
+        firsts, keys = self._owners
+        return keys[bisect_right(firsts, doc_id) - 1]
+
+    def update(self):
+        """
+        Bring the index in line with the CSVs on disk, re-reading only files
+        whose mtime or size changed. Returns True if anything changed.
+        """
+        with span('SearchIndex.update'):
+            found = self._scan()
+            stale = [k for k in self.segments if self.segments[k]['sig'] != found.get(k)]
+            fresh = [k for k in found if k not in self.segments or k in stale]
+            if not stale and not fresh:
+                return False
+
+            for key in stale:
+                self._drop_segment(key)
+            if self.doc_count and len(self.dead) > COMPACT_RATIO * self.doc_count:
+                self._reset()
+                fresh = list(found)
+            for key in fresh:
+                self._add_segment(key, found[key])
+            return True
+
+    def open(self):
+        """Load the persisted index, apply any CSV changes, and save if needed."""
+        self.load()
+        if self.update():
+            self.save()
+        return self
+
+    # ---- querying ------------------------------------------------------
+
+    def search(self, query, limit=10):
+        """
+        Fuzzy lookup: documents ranked by shared trigrams with the query,
+        shorter strings first on ties. Returns dicts with english, macedonian,
+        topic and file (the owning sublesson CSV).
+        """
+        grams = [g for g in _query_grams(query) if g in self.postings]
+        if not query.strip() or not grams:
+            return []
+        grams.sort(key=lambda g: len(self.postings[g]))
+
+        dead = self.dead
+        texts = self.texts
+        counts = Counter()
+        for gram in grams:
+            ids = self.postings[gram]
+            # counts holds live documents only, so tombstones from
+            # incremental updates can't end the scan before real matches
+            if len(ids) > MAX_POSTINGS and counts:
+                break
+            counts.update((d for d in ids if d not in dead) if dead else ids)
+
+        best = heapq.nlargest(
+            limit,
+            counts,
+            key=lambda d: (counts[d], -len(texts[2 * d]) - len(texts[2 * d + 1]))
+        )
+        results = []
+        for d in best:
+            topic, fn = self._segment_of(d).split('/', 1)
+            results.append({'english': texts[2 * d], 'macedonian': texts[2 * d + 1],
+                            'topic': topic, 'file': fn})
+        return results
@@ -0,0 +1,216 @@
+# FILE: sentence_audio.py
+# Sentence playback stitched from cached per-block clips, crossfaded in memory
+
+import io
+import os
+import wave
+import asyncio
+import hashlib
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from edge_tts import Communicate
+
+from constants import AUDIO_CACHE_DIR
+from tracing import span
+
+try:
+    import miniaudio  # optional: decodes edge_tts MP3 output to PCM in memory
+except ImportError:
+    miniaudio = None
+
+try:
+    import winsound  # Windows only, like the MCI playback in QuizFrame
+except ImportError:
+    winsound = None
+
+VOICE = 'mk-MK-AleksandarNeural'
+SAMPLE_RATE = 24000
+CROSSFADE_MS = 25
+SILENCE_THRESHOLD = 400   # |sample| below this counts as silence when trimming
+EDGE_PAD_MS = 30          # silence kept at each end of a trimmed clip
+
+
+def _trim(samples):
+    """Drop the leading/trailing silence TTS puts around every clip."""
+    n = len(samples)
+    start = 0
+    while start < n and abs(samples[start]) < SILENCE_THRESHOLD:
+        start += 1
+    end = n
+    while end > start and abs(samples[end - 1]) < SILENCE_THRESHOLD:
+        end -= 1
+    pad = SAMPLE_RATE * EDGE_PAD_MS // 1000
+    return samples[max(0, start - pad):min(n, end + pad)]
+
+
+def crossfade_join(clips, fade_ms=CROSSFADE_MS):
+    """Concatenate 16-bit PCM clips, overlapping each seam with a linear crossfade."""
+    out = array('h')
+    fade = SAMPLE_RATE * fade_ms // 1000
+    for clip in clips:
+        overlap = min(fade, len(out), len(clip))
+        if overlap:
+            tail = len(out) - overlap
+            for i in range(overlap):
+                w = (i + 1) / (overlap + 1)
+                out[tail + i] = int(out[tail + i] * (1 - w) + clip[i] * w)
+        out.extend(clip[overlap:])
+    return out
+
+
+def to_wav_bytes(samples):
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+class SentenceAudio:
+    """
+    Speaks Macedonian sentences for the sentence builder.
+
+    Each block (word or phrase) is synthesised once, decoded to PCM and kept
+    both in memory and as a WAV in audio_cache/. A sentence is played by
+    joining its block clips in a buffer, so playback is immediate once the
+    blocks are cached and nothing is written to disk per play. Whole-sentence
+    synthesis is queued in the background and replaces the stitched version
+    for later plays.
+    """
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.available = miniaudio is not None and winsound is not None
+        if winsound is None:
+            self.unavailable_reason = 'Sentence audio is only supported on Windows.'
+        elif miniaudio is None:
+            self.unavailable_reason = ("Sentence audio needs the 'miniaudio' package "
+                                       "(pip install miniaudio).")
+        else:
+            self.unavailable_reason = None
+        self._clips = {}
+        self._pending = {}  # text -> Future of an in-flight synthesis
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tts')
+        if self.available:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, text):
+        digest = hashlib.sha1(f'{VOICE}\n{text}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{digest}.wav')
+
+    def _cached(self, text):
+        with self._lock:
+            clip = self._clips.get(text)
+        if clip is not None:
+            return clip
+        path = self._path(text)
+        if not os.path.exists(path):
+            return None
+        try:
+            with wave.open(path, 'rb') as w:
+                frames = w.getnframes()
+                data = w.readframes(frames)
+            if len(data) != frames * 2:
+                raise EOFError('truncated clip')
+            clip = array('h', data)
+        except (wave.Error, EOFError, ValueError, OSError):
+            # unreadable (e.g. left by a crash before atomic writes): a cache miss
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            self._clips[text] = clip
+        return clip
+
+    def _synthesize(self, text):
+        """Blocking: edge_tts → MP3 bytes in memory → trimmed PCM clip, cached."""
+        with span('SentenceAudio._synthesize'):
+            try:
+                return self._synthesize_uncached(text)
+            finally:
+                with self._lock:
+                    self._pending.pop(text, None)
+
+    def _synthesize_uncached(self, text):
+        async def fetch():
+            mp3 = bytearray()
+            async for chunk in Communicate(text=text, voice=VOICE).stream():
+                if chunk['type'] == 'audio':
+                    mp3.extend(chunk['data'])
+            return bytes(mp3)
+
+        decoded = miniaudio.decode(
+            asyncio.run(fetch()),
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=1, sample_rate=SAMPLE_RATE
+        )
+        clip = _trim(array('h', decoded.samples))
+        path = self._path(text)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(to_wav_bytes(clip))
+        os.replace(tmp, path)  # a crash mid-write never leaves a partial clip
+        with self._lock:
+            self._clips[text] = clip
+        return clip
+
+    def _queue(self, text):
+        """Schedule background synthesis of text; returns its Future, or None if cached."""
+        with self._lock:
+            if text in self._clips:
+                return None
+            fut = self._pending.get(text)
+            if fut is None:
+                fut = self._pending[text] = self._pool.submit(self._synthesize, text)
+            return fut
+
+    def prefetch(self, blocks):
+        """Warm the cache for a sentence's blocks before the learner asks to hear it."""
+        if not self.available:
+            return
+        for block in blocks:
+            if self._cached(block) is None:
+                self._queue(block)
+
+    def play(self, sentence, blocks):
+        """Speak a sentence: the full clip if cached, else its blocks stitched together."""
+        if not self.available:
+            return
+        full = self._cached(sentence)
+        if full is not None:
+            self._start(full)
+            return
+
+        clips = [self._cached(b) for b in blocks]
+        if all(c is not None for c in clips):
+            with span('SentenceAudio.join', blocks=len(clips)):
+                joined = crossfade_join(clips)
+            self._start(joined)
+        else:
+            missing = [self._queue(b) for b, c in zip(blocks, clips) if c is None]
+
+            def play_when_ready():
+                for fut in missing:
+                    if fut is not None and fut.exception() is not None:
+                        return
+                parts = [self._cached(b) for b in blocks]
+                if all(p is not None for p in parts):
+                    self._play_samples(crossfade_join(parts))
+            # waits on the synthesis pool, so it must not occupy one of its workers
+            threading.Thread(target=play_when_ready, daemon=True).start()
+
+        # background upgrade to natural whole-sentence prosody
+        self._queue(sentence)
+
+    def _start(self, samples):
+        threading.Thread(target=self._play_samples, args=(samples,), daemon=True).start()
+
+    def _play_samples(self, samples):
+        # SND_MEMORY cannot be combined with SND_ASYNC, so callers run this off the Tk thread
+        winsound.PlaySound(to_wav_bytes(samples), winsound.SND_MEMORY | winsound.SND_NODEFAULT)
@@ -2,6 +2,15 @@
 
 import csv
 
+from tracing import span
+
+def direction_from_filename(fn):
+    """'sentence_1_mk_en.csv' -> 'mk->en'; files without a direction suffix default to 'en->mk'."""
+    parts = fn[:-4].split('_')
+    if len(parts) >= 4 and parts[-2] in ('en', 'mk') and parts[-1] in ('en', 'mk'):
+        return f"{parts[-2]}->{parts[-1]}"
+    return 'en->mk'
+
 class SentenceBuilderLesson:
     """
     Loads CSV rows of:
@@ -12,7 +21,7 @@ class SentenceBuilderLesson:
     """
     def __init__(self, filepath):
         self.items = []
-        with open(filepath, encoding='utf-8') as f:
+        with span('SentenceBuilderLesson.parse', path=filepath), open(filepath, encoding='utf-8') as f:
             reader = csv.reader(f)
             for row in reader:
                 if len(row) < 2:
@@ -0,0 +1,369 @@
+# FILE: server.py
+# Classroom mode: serves the lesson engine to many learners over a local HTTP/JSON API
+
+import os
+import re
+import sys
+import json
+import asyncio
+import secrets
+
+from constants import LESSONS_DIR, CLASSROOM_DIR
+from lesson import Lesson
+from matching import MatchingLesson
+from sentence_builder import SentenceBuilderLesson, direction_from_filename
+from progress_manager import load_progress, save_progress, record_completion
+from tracing import span
+
+FLUSH_INTERVAL = 2.0  # seconds between batched progress writes
+MAX_BODY = 64 * 1024
+
+_STATUS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+_LEARNER_RE = re.compile(r'[^0-9A-Za-z_-]+')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _display_name(topic):
+    return topic.split('_', 1)[1].replace('_', ' ').title()
+
+
+class LessonCache:
+    """
+    Topic listing plus parsed sublessons, shared by every client. Each sublesson
+    is parsed once with the same lesson classes the desktop app uses, and the
+    serialised JSON body is kept so repeat requests cost a dict lookup.
+    """
+    def __init__(self, lessons_dir=LESSONS_DIR):
+        self.lessons_dir = lessons_dir
+        self.topics = sorted(
+            d for d in os.listdir(lessons_dir)
+            if os.path.isdir(os.path.join(lessons_dir, d))
+        )
+        self.sublessons = {
+            t: sorted(f for f in os.listdir(os.path.join(lessons_dir, t)) if f.endswith('.csv'))
+            for t in self.topics
+        }
+        self._bodies = {}
+        self.topics_body = _dumps([
+            {'id': t, 'name': _display_name(t), 'sublessons': len(self.sublessons[t])}
+            for t in self.topics
+        ])
+
+    def topic_index(self, topic):
+        try:
+            return self.topics.index(topic)
+        except ValueError:
+            raise HTTPError(404, f'Unknown topic: {topic}')
+
+    def sublesson_list_body(self, topic):
+        key = (topic, None)
+        if key not in self._bodies:
+            self.topic_index(topic)
+            self._bodies[key] = _dumps([
+                {'index': i, 'file': fn, 'kind': self._kind(fn)}
+                for i, fn in enumerate(self.sublessons[topic])
+            ])
+        return self._bodies[key]
+
+    def sublesson_body(self, topic, sub_idx):
+        key = (topic, sub_idx)
+        body = self._bodies.get(key)
+        if body is None:
+            self.topic_index(topic)
+            files = self.sublessons[topic]
+            if not 0 <= sub_idx < len(files):
+                raise HTTPError(404, f'Unknown sublesson: {topic}/{sub_idx}')
+            with span('LessonCache.parse', topic=topic, sublesson=sub_idx):
+                try:
+                    parsed = self._parse(topic, files[sub_idx])
+                except (OSError, ValueError, UnicodeDecodeError) as e:
+                    # e.g. a row without exactly two columns in a definitions CSV
+                    raise HTTPError(500, f'Could not load {topic}/{files[sub_idx]}: {e}')
+                body = self._bodies[key] = _dumps(parsed)
+        return body
+
+    @staticmethod
+    def _kind(fn):
+        if fn.startswith('match_'):
+            return 'matching'
+        if fn.startswith('sentence_'):
+            return 'sentence'
+        return 'definitions'
+
+    def _parse(self, topic, fn):
+        filepath = os.path.join(self.lessons_dir, topic, fn)
+        kind = self._kind(fn)
+        if kind == 'matching':
+            obj = MatchingLesson(filepath)
+            return {'kind': kind, 'pairs': obj.pairs,
+                    'left': obj.left_items, 'right': obj.right_items}
+        if kind == 'sentence':
+            obj = SentenceBuilderLesson(filepath)
+            return {'kind': kind, 'direction': direction_from_filename(fn), 'items': [
+                {'en': eng, 'mk': mac, 'mk_blocks': mk_blocks, 'en_blocks': en_blocks}
+                for eng, mac, mk_blocks, en_blocks in obj.items
+            ]}
+        obj = Lesson(filepath)
+        return {'kind': kind, 'cards': obj.cards, 'answers': obj.all_answers}
+
+
+class ProgressStore:
+    """
+    Per-learner progress held in memory and written to classroom/<learner>.json
+    in batches: completions only mark a learner dirty, and a background task
+    flushes all dirty learners every FLUSH_INTERVAL seconds.
+    """
+    def __init__(self, directory=CLASSROOM_DIR):
+        self.directory = directory
+        self.learners = {}
+        self.dirty = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, learner):
+        return os.path.join(self.directory, f'{learner}.json')
+
+    def get(self, learner):
+        state = self.learners.get(learner)
+        if state is None:
+            unlocked, progress = load_progress(self._path(learner))
+            state = self.learners[learner] = {'unlocked_topic': unlocked, 'topic_progress': progress}
+        return state
+
+    def mark_dirty(self, learner):
+        self.dirty.add(learner)
+
+    def snapshot(self):
+        """Copy out and clear the dirty set; call on the event loop thread."""
+        batch, self.dirty = self.dirty, set()
+        return [
+            (learner, self.learners[learner]['unlocked_topic'],
+             {t: dict(v) for t, v in self.learners[learner]['topic_progress'].items()})
+            for learner in batch
+        ]
+
+    def write(self, snapshot):
+        """Persist a snapshot; safe to run in a worker thread."""
+        with span('ProgressStore.write', learners=len(snapshot)):
+            for learner, unlocked, progress in snapshot:
+                save_progress(unlocked, progress, path=self._path(learner))
+
+    def flush(self):
+        self.write(self.snapshot())
+
+    async def write_async(self, snapshot):
+        """
+        Persist a snapshot in a worker thread. On failure (disk full,
+        permissions) the error is reported and the learners are marked dirty
+        again, so the next flush retries them with their latest progress.
+        """
+        try:
+            await asyncio.to_thread(self.write, snapshot)
+        except Exception as e:
+            print(f'Could not save classroom progress: {e}', file=sys.stderr)
+            self.dirty.update(learner for learner, _, _ in snapshot)
+
+
+class ClassroomServer:
+    def __init__(self, cache=None, store=None, flush_interval=FLUSH_INTERVAL):
+        self.cache = cache or LessonCache()
+        self.store = store or ProgressStore()
+        self.flush_interval = flush_interval
+        self.sessions = {}
+        self._server = None
+        self._flusher = None
+        self._writing = None   # in-flight background progress write
+        self._connections = {}  # open client writer -> its handler task
+
+    # ---- routing -------------------------------------------------------
+
+    def route(self, method, path, body):
+        parts = [p for p in path.split('?', 1)[0].split('/') if p]
+
+        if parts == ['topics']:
+            self._expect(method, 'GET')
+            return 200, self.cache.topics_body
+        if len(parts) == 2 and parts[0] == 'topics':
+            self._expect(method, 'GET')
+            return 200, self.cache.sublesson_list_body(parts[1])
+        if len(parts) == 3 and parts[0] == 'topics':
+            self._expect(method, 'GET')
+            return 200, self.cache.sublesson_body(parts[1], self._int(parts[2]))
+
+        if parts == ['sessions']:
+            self._expect(method, 'POST')
+            learner = _LEARNER_RE.sub('', str(self._json(body).get('learner', '')))
+            if not learner:
+                raise HTTPError(400, 'A learner name is required')
+            token = secrets.token_urlsafe(12)
+            self.sessions[token] = learner
+            return 201, _dumps({'session': token, 'learner': learner, **self.store.get(learner)})
+        if len(parts) >= 2 and parts[0] == 'sessions':
+            learner = self.sessions.get(parts[1])
+            if learner is None:
+                raise HTTPError(404, 'Unknown session')
+            if len(parts) == 2:
+                self._expect(method, 'GET')
+                return 200, _dumps(self.store.get(learner))
+            if parts[2:] == ['complete']:
+                self._expect(method, 'POST')
+                return 200, _dumps(self._complete(learner, self._json(body)))
+
+        raise HTTPError(404, f'No route for {path}')
+
+    def _complete(self, learner, data):
+        topic = data.get('topic')
+        topic_idx = self.cache.topic_index(topic)
+        sub_idx = self._int(data.get('sublesson'))
+        total = len(self.cache.sublessons[topic])
+        if not 0 <= sub_idx < total:
+            raise HTTPError(404, f'Unknown sublesson: {topic}/{sub_idx}')
+        state = self.store.get(learner)
+        state['unlocked_topic'] = record_completion(
+            state['unlocked_topic'], state['topic_progress'], topic, topic_idx, sub_idx, total
+        )
+        self.store.mark_dirty(learner)
+        return state
+
+    @staticmethod
+    def _expect(method, allowed):
+        if method != allowed:
+            raise HTTPError(405, f'Use {allowed}')
+
+    @staticmethod
+    def _int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f'Expected an integer, got {value!r}')
+
+    @staticmethod
+    def _json(body):
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, 'Body is not valid JSON')
+        if not isinstance(data, dict):
+            raise HTTPError(400, 'Body must be a JSON object')
+        return data
+
+    # ---- HTTP ----------------------------------------------------------
+
+    async def handle(self, reader, writer):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, _dumps({'error': 'Malformed request line'}), False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, _dumps({'error': 'Invalid Content-Length'}), False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, _dumps({'error': 'Body too large'}), False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, payload = self.route(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, _dumps({'error': str(e)})
+                except Exception as e:
+                    status, payload = 500, _dumps({'error': f'Internal error: {e}'})
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        head = (
+            f'HTTP/1.1 {status} {_STATUS.get(status, "")}\r\n'
+            'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(payload)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+        ).encode('latin-1')
+        writer.write(head + payload)
+        await writer.drain()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.store.dirty:
+                # shielded so that stop() can cancel the loop and still await this write
+                self._writing = asyncio.ensure_future(self.store.write_async(self.store.snapshot()))
+                await asyncio.shield(self._writing)
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        self._flusher = asyncio.create_task(self._flush_loop())
+        return self._server
+
+    async def stop(self):
+        if self._flusher:
+            self._flusher.cancel()
+        if self._server:
+            self._server.close()
+            # wait_closed() waits for open connections, so close idle keep-alives
+            # and let their handlers see EOF and return
+            handlers = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            if handlers:
+                await asyncio.wait(handlers, timeout=5)
+            await self._server.wait_closed()
+        # the final flush must land after any older snapshot still being
+        # written; write_async reports failures rather than raising
+        if self._writing is not None:
+            await self._writing
+        await self.store.write_async(self.store.snapshot())
+
+
+async def _serve_forever(host, port):
+    server = ClassroomServer()
+    await server.start(host, port)
+    print(f'Classroom server on http://{host}:{port} ({len(server.cache.topics)} topics)')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def serve(host='127.0.0.1', port=8765):
+    try:
+        asyncio.run(_serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,171 @@
+# FILE: tracing.py
+# Lightweight span tracing for the hot paths, exported as Chrome trace events
+
+import os
+import json
+import time
+import atexit
+import threading
+import functools
+
+ENV_VAR = 'LEARNMK_TRACE'
+_ENV_OFF = {'0', 'false', 'off', 'no'}
+_ENV_ON = {'1', 'true', 'on', 'yes'}
+
+_enabled = False
+_output_path = None
+_events = []
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+class _NullSpan:
+    """Shared no-op span handed out while tracing is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        event = {
+            'name': self.name,
+            'ph': 'X',
+            'ts': self.start / 1000,
+            'dur': (end - self.start) / 1000,
+            'pid': _pid,
+            'tid': threading.get_ident(),
+        }
+        if self.args:
+            event['args'] = self.args
+        with _lock:
+            _events.append(event)
+        return False
+
+
+def span(name, **args):
+    """
+    Context manager timing the enclosed block as a trace span.
+    Returns a shared no-op object when tracing is off, so the disabled cost
+    is a single global lookup.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Decorator wrapping every call of a function in a span."""
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*a, **kw):
+            if not _enabled:
+                return func(*a, **kw)
+            with _Span(label, None):
+                return func(*a, **kw)
+        return wrapper
+    return decorate
+
+
+def enable(output_path='trace.json'):
+    """Start recording spans; the trace is written to output_path at exit."""
+    global _enabled, _output_path
+    if _output_path is None:
+        atexit.register(_dump_at_exit)
+    _output_path = output_path
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable_from_env():
+    """
+    Turn tracing on from LEARNMK_TRACE: 1/true/on/yes write trace.json,
+    0/false/off/no (or unset) leave it off, anything else is the output path.
+    """
+    value = os.environ.get(ENV_VAR, '').strip()
+    if not value or value.lower() in _ENV_OFF:
+        return
+    enable('trace.json' if value.lower() in _ENV_ON else value)
+
+
+def export_chrome_trace(path):
+    """Write recorded spans in the Chrome trace-event format (chrome://tracing, Perfetto)."""
+    with _lock:
+        events = list(_events)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+
+def _percentile(sorted_values, pct):
+    idx = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[idx]
+
+
+def summary():
+    """Return {span name: {count, total_ms, p50_ms, p95_ms}} for recorded spans."""
+    durations = {}
+    with _lock:
+        for e in _events:
+            durations.setdefault(e['name'], []).append(e['dur'] / 1000)
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {
+            'count': len(values),
+            'total_ms': sum(values),
+            'p50_ms': _percentile(values, 50),
+            'p95_ms': _percentile(values, 95),
+        }
+    return stats
+
+
+def format_summary():
+    stats = summary()
+    if not stats:
+        return 'No spans recorded.'
+    width = max(len(n) for n in stats)
+    lines = [f"{'span':<{width}}  {'count':>6}  {'p50 ms':>9}  {'p95 ms':>9}  {'total ms':>10}"]
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1]['total_ms']):
+        lines.append(
+            f"{name:<{width}}  {s['count']:>6}  {s['p50_ms']:>9.3f}  "
+            f"{s['p95_ms']:>9.3f}  {s['total_ms']:>10.3f}"
+        )
+    return '\n'.join(lines)
+
+
+def _dump_at_exit():
+    if not _events or _output_path is None:
+        return
+    export_chrome_trace(_output_path)
+    base, _ = os.path.splitext(_output_path)
+    with open(base + '_summary.txt', 'w', encoding='utf-8') as f:
+        f.write(format_summary() + '\n')
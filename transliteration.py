@@ -0,0 +1,92 @@
+# FILE: transliteration.py
+# Latin → Macedonian Cyrillic transliteration and answer normalisation
+
+import re
+
+# Longest spellings first is handled by lookup order in to_cyrillic, so the
+# table can stay in alphabet order. Covers the official romanisation plus the
+# informal digraphs learners type on a plain keyboard.
+LATIN_TO_CYRILLIC = {
+    'a': 'а', 'b': 'б', 'v': 'в', 'g': 'г', 'd': 'д',
+    'gj': 'ѓ', 'ǵ': 'ѓ', 'đ': 'ѓ',
+    'e': 'е', 'zh': 'ж', 'ž': 'ж', 'z': 'з', 'dz': 'ѕ',
+    'i': 'и', 'j': 'ј', 'y': 'ј', 'k': 'к', 'l': 'л', 'lj': 'љ',
+    'm': 'м', 'n': 'н', 'nj': 'њ', 'o': 'о', 'p': 'п', 'r': 'р',
+    's': 'с', 't': 'т', 'kj': 'ќ', 'ḱ': 'ќ', 'ć': 'ќ',
+    'u': 'у', 'f': 'ф', 'h': 'х', 'c': 'ц', 'ts': 'ц',
+    'ch': 'ч', 'č': 'ч', 'dzh': 'џ', 'dž': 'џ', 'dj': 'џ',
+    'sh': 'ш', 'š': 'ш', 'w': 'в', 'x': 'кс', 'q': 'к',
+}
+_MAX_KEY = max(len(k) for k in LATIN_TO_CYRILLIC)
+# Informal digraphs that also occur as two separate letters (detstvo, nadzor,
+# podjadi): readers of these try both the digraph and the shorter match.
+AMBIGUOUS = {'ts', 'dz', 'dj', 'dzh'}
+MAX_VARIANTS = 64
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _matches_at(text, i):
+    """(key length, Cyrillic) readings at position i, longest first."""
+    found = []
+    for size in range(min(_MAX_KEY, len(text) - i), 0, -1):
+        cyr = LATIN_TO_CYRILLIC.get(text[i:i + size])
+        if cyr is not None:
+            found.append((size, cyr))
+            if text[i:i + size] not in AMBIGUOUS:
+                break
+    return found or [(1, text[i])]
+
+
+def to_cyrillic(text: str) -> str:
+    """Transliterate Latin letters to Cyrillic, taking the longest match; anything else passes through."""
+    text = text.lower()
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        size, cyr = _matches_at(text, i)[0]
+        out.append(cyr)
+        i += size
+    return ''.join(out)
+
+
+def to_cyrillic_variants(text: str) -> set:
+    """
+    Every reading of text, branching on the ambiguous digraphs, so 'detstvo'
+    yields both 'децтво' and 'детство'. Capped at MAX_VARIANTS readings.
+    """
+    text = text.lower()
+    partial = {0: {''}}  # position -> readings of text[:position]
+    for i in range(len(text)):
+        prefixes = partial.pop(i, None)
+        if not prefixes:
+            continue
+        for size, cyr in _matches_at(text, i):
+            bucket = partial.setdefault(i + size, set())
+            for prefix in prefixes:
+                if len(bucket) >= MAX_VARIANTS:
+                    break
+                bucket.add(prefix + cyr)
+    return partial.get(len(text), {''})
+
+
+def _clean(text):
+    text = _PUNCT_RE.sub(' ', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def normalize(text: str) -> str:
+    """
+    Comparison form of an answer: lower-case Cyrillic with punctuation dropped
+    and whitespace collapsed, so 'Dobro utro!' and 'Добро утро' compare equal.
+    """
+    return _clean(to_cyrillic(text.replace('’', '').replace("'", '')))
+
+
+def normalize_variants(text: str) -> set:
+    """normalize() for every reading of the ambiguous digraphs."""
+    return {_clean(v) for v in to_cyrillic_variants(text.replace('’', '').replace("'", ''))}
+
+
+def answers_match(typed: str, correct: str) -> bool:
+    return normalize(correct) in normalize_variants(typed)
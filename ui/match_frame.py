@@ -5,6 +5,7 @@ import customtkinter as ctk
 import tkinter.messagebox as mb
 
 from constants import resource_path  # 🔁 Added for future file compatibility
+from tracing import traced
 
 class MatchFrame(ctk.CTkFrame):
     def __init__(self, master, on_finish, on_back):
@@ -38,6 +39,7 @@ class MatchFrame(ctk.CTkFrame):
         self.back_btn = ctk.CTkButton(self, text='Back', command=on_back)
         self.back_btn.pack(pady=5)
 
+    @traced('MatchFrame.start')
     def start(self, matching_lesson, topic_display, sub_idx):
         self.match = matching_lesson
         self.sublesson_index = sub_idx
@@ -2,15 +2,21 @@
 
 import customtkinter as ctk
 from constants import resource_path  # ✅ future-proofing for asset access
+from tracing import traced
 
 DISPLAY_OVERRIDES = {
     'basicverbs': 'Basic Verbs',
 }
 
+SEARCH_DELAY_MS = 150  # wait for a pause in typing before querying
+MAX_RESULTS = 8
+
 class MenuFrame(ctk.CTkFrame):
     def __init__(self, master, topics,
                  on_select, on_view_progress,
-                 on_save, on_reset, on_exit):
+                 on_save, on_reset, on_exit,
+                 on_export=None, on_import=None,
+                 on_search=None, on_open_result=None):
         super().__init__(master)
         self.topics = topics
         self._on_select = on_select
@@ -18,12 +24,30 @@ class MenuFrame(ctk.CTkFrame):
         self._on_save = on_save
         self._on_reset = on_reset
         self._on_exit = on_exit
+        self._on_export = on_export
+        self._on_import = on_import
+        self._on_search = on_search
+        self._on_open_result = on_open_result
+        self._search_job = None
 
         container = ctk.CTkFrame(self)
         container.pack(expand=True)
 
         ctk.CTkLabel(container, text='Choose a Topic', font=('Arial', 24, 'bold')).pack(pady=20)
 
+        if self._on_search:
+            self.search_entry = ctk.CTkEntry(
+                container, width=600, placeholder_text='Search words and phrases (English or Macedonian)'
+            )
+            self.search_entry.pack(pady=(0, 5))
+            self.search_entry.bind('<KeyRelease>', self._schedule_search)
+            self.search_entry.bind('<Escape>', lambda e: self._clear_search())
+            # packed once so results can be shown/hidden in place without
+            # pack(before=...), which needs a packed sibling
+            results_slot = ctk.CTkFrame(container, fg_color='transparent', width=0, height=0)
+            results_slot.pack()
+            self.results_frame = ctk.CTkScrollableFrame(results_slot, width=600, height=150)
+
         self.topic_scroll = ctk.CTkScrollableFrame(container, width=600, height=300)
         self.topic_scroll.pack(pady=10)
         self._build_topic_buttons()
@@ -35,9 +59,52 @@ class MenuFrame(ctk.CTkFrame):
         ctk.CTkButton(btnf, text='View Progress', command=self._on_view_progress).grid(row=0, column=0, padx=5, pady=5)
         ctk.CTkButton(btnf, text='Save Progress', command=self._on_save).grid(row=0, column=1, padx=5, pady=5)
         ctk.CTkButton(btnf, text='Reset Progress', command=self._on_reset).grid(row=0, column=2, padx=5, pady=5)
+        if self._on_export and self._on_import:
+            ctk.CTkButton(btnf, text='Export Progress', command=self._on_export).grid(row=1, column=0, padx=5, pady=5)
+            ctk.CTkButton(btnf, text='Import Progress', command=self._on_import).grid(row=1, column=2, padx=5, pady=5)
 
         ctk.CTkButton(container, text='Exit', command=self._on_exit).pack(pady=(10, 0), padx=50)
 
+    def _schedule_search(self, event=None):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        query = self.search_entry.get().strip()
+        for child in self.results_frame.winfo_children():
+            child.destroy()
+        if not query:
+            self.results_frame.pack_forget()
+            return
+
+        results = self._on_search(query, MAX_RESULTS)
+        if isinstance(results, str):  # status message, e.g. index still loading
+            ctk.CTkLabel(self.results_frame, text=results, wraplength=560).pack(pady=5)
+            results = []
+        elif not results:
+            ctk.CTkLabel(self.results_frame, text='No matches.').pack(pady=5)
+        for r in results:
+            topic = r['topic'].split('_', 1)[1]
+            display = DISPLAY_OVERRIDES.get(topic.lower(), topic.replace('_', ' ').title())
+            ctk.CTkButton(
+                self.results_frame,
+                text=f"{r['english']} — {r['macedonian']}   ({display})",
+                anchor='w',
+                command=lambda res=r: self._open_result(res)
+            ).pack(fill='x', pady=3, padx=10)
+        self.results_frame.pack(pady=(0, 5))
+
+    def _open_result(self, result):
+        self._clear_search()
+        self._on_open_result(result)
+
+    def _clear_search(self):
+        self.search_entry.delete(0, 'end')
+        self._run_search()
+
+    @traced('MenuFrame._build_topic_buttons')
     def _build_topic_buttons(self):
         for child in self.topic_scroll.winfo_children():
             child.destroy()
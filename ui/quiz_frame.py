@@ -11,11 +11,16 @@ import tkinter.messagebox as mb
 from edge_tts import Communicate
 
 from constants import resource_path  # ✅ for future resource loading compatibility
+from tracing import traced
+from transliteration import answers_match
+
+MAX_SUGGESTIONS = 5
 
 class QuizFrame(ctk.CTkFrame):
-    def __init__(self, master, on_finish, on_back):
+    def __init__(self, master, on_finish, on_back, vocab=None):
         super().__init__(master)
         self.on_finish = on_finish
+        self.vocab = vocab  # VocabTrie used for typed-answer suggestions
 
         # MCI interface for playback
         self._mci = ctypes.windll.winmm.mciSendStringW
@@ -39,12 +44,36 @@ class QuizFrame(ctk.CTkFrame):
         self.choice_var = ctk.StringVar()
         self.choice_buttons = []
 
-        nav_frame = ctk.CTkFrame(self.container)
+        # Typed-answer area, shown instead of the choices when typed mode is on
+        self.typed_frame = ctk.CTkFrame(self.container)
+        self.answer_entry = ctk.CTkEntry(
+            self.typed_frame, width=300, height=40,
+            placeholder_text='Type in Cyrillic or Latin letters'
+        )
+        self.answer_entry.pack(pady=(8, 4))
+        self.answer_entry.bind('<KeyRelease>', self._update_suggestions)
+        self.answer_entry.bind('<Return>', lambda e: self.check_answer())
+        # Suggestion buttons are created once and relabelled per keystroke
+        self.suggestion_buttons = []
+        for _ in range(MAX_SUGGESTIONS):
+            btn = ctk.CTkButton(
+                self.typed_frame, text='', width=300, height=28,
+                fg_color='darkblue', hover_color='blue'
+            )
+            btn.configure(command=lambda b=btn: self._accept_suggestion(b.cget('text')))
+            self.suggestion_buttons.append(btn)
+
+        self.nav_frame = nav_frame = ctk.CTkFrame(self.container)
         nav_frame.pack(pady=5)
         self.prev_btn = ctk.CTkButton(nav_frame, text='Previous', command=self.prev_card)
         self.prev_btn.grid(row=0, column=0, padx=10)
         self.submit_btn = ctk.CTkButton(nav_frame, text='Submit', command=self.check_answer)
         self.submit_btn.grid(row=0, column=1, padx=10)
+        self.typed_mode = ctk.BooleanVar(value=False)
+        self.mode_switch = ctk.CTkSwitch(
+            nav_frame, text='Type answers', variable=self.typed_mode, command=self._toggle_mode
+        )
+        self.mode_switch.grid(row=0, column=2, padx=10)
 
         self.card_idx = 0
         self.score = 0
@@ -53,6 +82,7 @@ class QuizFrame(ctk.CTkFrame):
 
         self._audio_cache = {}
 
+    @traced('QuizFrame._prefetch_audio')
     def _prefetch_audio(self, text: str):
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
         mp3_path = tmp.name
@@ -75,6 +105,25 @@ class QuizFrame(ctk.CTkFrame):
                 self._play_audio(self._audio_cache[text])
             threading.Thread(target=synth_and_play, daemon=True).start()
 
+    def _toggle_mode(self):
+        if self.lesson is not None and self.card_idx < len(self.lesson.cards):
+            self.show_card()
+
+    def _update_suggestions(self, event=None):
+        matches = self.vocab.suggest(self.answer_entry.get(), MAX_SUGGESTIONS) if self.vocab else []
+        for i, btn in enumerate(self.suggestion_buttons):
+            if i < len(matches):
+                btn.configure(text=matches[i])
+                btn.pack(fill='x', pady=2)
+            else:
+                btn.pack_forget()
+
+    def _accept_suggestion(self, text):
+        self.answer_entry.delete(0, 'end')
+        self.answer_entry.insert(0, text)
+        self._update_suggestions()
+        self.speak(text)
+
     def start(self, lesson_obj, topic_display, sub_idx):
         self.lesson = lesson_obj
         self.sublesson_index = sub_idx
@@ -84,6 +133,7 @@ class QuizFrame(ctk.CTkFrame):
         self.show_card()
         self.pack(fill='both', expand=True)
 
+    @traced('QuizFrame.show_card')
     def show_card(self):
         for path in self._audio_cache.values():
             try:
@@ -105,6 +155,16 @@ class QuizFrame(ctk.CTkFrame):
         self.choice_buttons.clear()
         self.choice_var.set('')
 
+        if self.typed_mode.get():
+            self.choice_frame.pack_forget()
+            self.typed_frame.pack(pady=10, before=self.nav_frame)
+            self.answer_entry.delete(0, 'end')
+            self._update_suggestions()
+            self.answer_entry.focus_set()
+            return
+        self.typed_frame.pack_forget()
+        self.choice_frame.pack(pady=10, before=self.nav_frame)
+
         opts = random.sample(
             [ans for ans in self.lesson.all_answers if ans != a], 3
         ) + [a]
@@ -132,12 +192,13 @@ class QuizFrame(ctk.CTkFrame):
             )
 
     def check_answer(self):
-        sel = self.choice_var.get()
+        typed = self.typed_mode.get()
+        sel = self.answer_entry.get().strip() if typed else self.choice_var.get()
         if not sel:
-            mb.showwarning('No Selection', 'Please choose an answer.')
+            mb.showwarning('No Selection', 'Please type an answer.' if typed else 'Please choose an answer.')
             return
         _, correct = self.lesson.cards[self.card_idx]
-        if sel == correct:
+        if (answers_match(sel, correct) if typed else sel == correct):
             self.score += 1
             mb.showinfo('Correct', 'Well done!')
         else:
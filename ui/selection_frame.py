@@ -4,6 +4,7 @@ import re
 import customtkinter as ctk
 
 from constants import resource_path  # ✅ Prepares for bundled asset support
+from tracing import traced
 
 DISPLAY_OVERRIDES = {
     'basicverbs':     'Basic Verbs',
@@ -14,6 +15,7 @@ DISPLAY_OVERRIDES = {
 }
 
 class SelectionFrame(ctk.CTkFrame):
+    @traced('SelectionFrame.__init__')
     def __init__(self, master, topic_folder, sublessons, on_start, on_back):
         super().__init__(master)
 
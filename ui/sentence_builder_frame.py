@@ -5,6 +5,8 @@ import customtkinter as ctk
 import tkinter.messagebox as mb
 
 from constants import resource_path  # ✅ for future compatibility with packaged assets
+from tracing import traced
+from sentence_audio import SentenceAudio
 
 class SentenceBuilderFrame(ctk.CTkFrame):
     def __init__(self, master, on_finish, on_back):
@@ -15,6 +17,7 @@ class SentenceBuilderFrame(ctk.CTkFrame):
         # English or Macedonian prompt
         self.prompt_label = ctk.CTkLabel(self, font=('Arial', 18, 'bold'))
         self.prompt_label.pack(pady=(10, 5))
+        self.prompt_label.bind('<Button-1>', lambda e: self._prompt_tapped())
 
         # Build area
         self.build_frame = ctk.CTkFrame(self)
@@ -40,6 +43,8 @@ class SentenceBuilderFrame(ctk.CTkFrame):
         self.built = []
         self.block_buttons = []
         self.direction = 'en->mk'  # or 'mk->en'
+        self.audio = SentenceAudio()
+        self._audio_warned = False
 
     def start(self, lesson_obj, topic_display, sub_idx, direction):
         """Initialize with a SentenceBuilderLesson and direction."""
@@ -54,6 +59,7 @@ class SentenceBuilderFrame(ctk.CTkFrame):
         self.pack_forget()
         self.on_back()
 
+    @traced('SentenceBuilderFrame._show_sentence')
     def _show_sentence(self):
         eng, mac, mk_blocks, en_blocks = self.lesson.items[self.idx]
 
@@ -65,7 +71,9 @@ class SentenceBuilderFrame(ctk.CTkFrame):
             prompt = mac
             blocks = en_blocks
 
-        self.prompt_label.configure(text=prompt)
+        # only a Macedonian prompt is tappable; in en->mk it would give the answer away
+        self.prompt_label.configure(text=prompt, cursor='hand2' if self.direction == 'mk->en' else '')
+        self.audio.prefetch(mk_blocks)
 
         # clear build area
         for w in self.build_frame.winfo_children():
@@ -114,9 +122,26 @@ class SentenceBuilderFrame(ctk.CTkFrame):
         if children:
             children[-1].destroy()
 
+    def _prompt_tapped(self):
+        if self.direction == 'mk->en':
+            self.speak_sentence()
+
+    def speak_sentence(self):
+        """Play the current Macedonian sentence (tap on a Macedonian prompt, or on submit)."""
+        if self.lesson is None or self.idx >= self.lesson.total:
+            return
+        if not self.audio.available:
+            if not self._audio_warned:
+                self._audio_warned = True
+                mb.showinfo('Audio unavailable', self.audio.unavailable_reason)
+            return
+        _, mac, mk_blocks, _ = self.lesson.items[self.idx]
+        self.audio.play(mac, mk_blocks)
+
     def check_answer(self):
         eng, mac, _, _ = self.lesson.items[self.idx]
         guess = ' '.join(self.built)
+        self.speak_sentence()
 
         # determine correct target
         correct = mac if self.direction == 'en->mk' else eng
@@ -0,0 +1,95 @@
+# FILE: vocab_trie.py
+# Compact prefix trie over the course's Macedonian vocabulary for typed-answer suggestions
+
+import os
+import csv
+from array import array
+
+from constants import LESSONS_DIR
+from transliteration import normalize, normalize_variants
+from tracing import span
+
+_CHAR_BITS = 21  # enough for any Unicode code point
+
+
+class VocabTrie:
+    """
+    Prefix trie built over the normalised (Cyrillic, lower-case) forms of the
+    vocabulary. Keys are inserted in sorted order, so every node covers a
+    contiguous range of the sorted word list; a lookup walks the prefix and
+    slices that range, costing O(len(prefix) + limit) regardless of size.
+
+    Edges live in one flat dict keyed by (node << 21 | code point) and ranges
+    in two int arrays, rather than one dict object per node.
+    """
+    def __init__(self, words):
+        with span('VocabTrie.build'):
+            by_key = {}
+            for word in words:
+                key = normalize(word)
+                if key:
+                    by_key.setdefault(key, word)
+            self.keys = sorted(by_key)
+            self.words = [by_key[k] for k in self.keys]
+
+            self._edges = {}
+            self._lo = array('I', [0])
+            self._hi = array('I', [len(self.keys)])
+            for idx, key in enumerate(self.keys):
+                node = 0
+                for ch in key:
+                    edge = (node << _CHAR_BITS) | ord(ch)
+                    child = self._edges.get(edge)
+                    if child is None:
+                        child = len(self._lo)
+                        self._edges[edge] = child
+                        self._lo.append(idx)
+                        self._hi.append(idx + 1)
+                    else:
+                        self._hi[child] = idx + 1
+                    node = child
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _find(self, key):
+        node = 0
+        for ch in key:
+            node = self._edges.get((node << _CHAR_BITS) | ord(ch))
+            if node is None:
+                return None
+        return node
+
+    def suggest(self, prefix, limit=5):
+        """
+        Return up to `limit` vocabulary entries whose normalised form starts
+        with `prefix`, trying every reading of ambiguous Latin digraphs.
+        """
+        ranges = []
+        for key in normalize_variants(prefix):
+            node = self._find(key) if key else None
+            if node is not None:
+                ranges.append((self._lo[node], self._hi[node]))
+        hits = sorted({i for lo, hi in ranges for i in range(lo, min(hi, lo + limit))})
+        return [self.words[i] for i in hits[:limit]]
+
+    def __contains__(self, word):
+        node = self._find(normalize(word))
+        return node is not None and self.keys[self._lo[node]] == normalize(word)
+
+
+def load_vocabulary(lessons_dir=LESSONS_DIR):
+    """Every Macedonian string in the course (second column of each lesson CSV)."""
+    words = []
+    for topic in sorted(os.listdir(lessons_dir)):
+        topic_path = os.path.join(lessons_dir, topic)
+        if not os.path.isdir(topic_path):
+            continue
+        for fn in sorted(os.listdir(topic_path)):
+            if not fn.endswith('.csv'):
+                continue
+            with open(os.path.join(topic_path, fn), encoding='utf-8') as f:
+                for row in csv.reader(f):
+                    if len(row) >= 2 and row[1].strip():
+                        words.append(row[1].strip())
+    return words